@@ -0,0 +1,75 @@
+"""
+Decode binary access logs (LOG_FORMAT=binary) back into JSON lines.
+
+Usage: python logtool.py service-a-1234.bin [service-b-5678.bin ...]
+"""
+import json
+import struct
+import sys
+import time
+import uuid
+
+# must match the record layouts in service-a/app.py and service-b/app.py
+_REC_ENDPOINT = struct.Struct("<BHH")
+_REC_ACCESS = struct.Struct("<BdHI16s16sHB")
+_LATENCY_UNKNOWN = 0xFFFFFFFF
+_REC_RID_LEN = struct.Struct("<H")
+
+
+def decode(data: bytes):
+    """Yield one dict per access record, shaped like the JSON access log."""
+    endpoints = {}
+    pos = 0
+    while pos < len(data):
+        kind = data[pos]
+        if kind == 0:
+            if pos + _REC_ENDPOINT.size > len(data):
+                break
+            _, eid, n = _REC_ENDPOINT.unpack_from(data, pos)
+            pos += _REC_ENDPOINT.size
+            # a restarted process re-issues ids from 0, so later definitions win
+            endpoints[eid] = data[pos:pos + n].decode()
+            pos += n
+        elif kind == 1:
+            if pos + _REC_ACCESS.size > len(data):
+                break  # truncated tail (process killed mid-write)
+            _, ts, status, latency, service, rid, eid, rid_kind = _REC_ACCESS.unpack_from(data, pos)
+            pos += _REC_ACCESS.size
+            if rid_kind == 1:
+                request_id = rid.hex()
+            elif rid_kind == 2:
+                request_id = str(uuid.UUID(bytes=rid))
+            else:
+                if pos + _REC_RID_LEN.size > len(data):
+                    break
+                (n,) = _REC_RID_LEN.unpack_from(data, pos)
+                pos += _REC_RID_LEN.size
+                if pos + n > len(data):
+                    break
+                request_id = data[pos:pos + n].decode(errors="replace")
+                pos += n
+            yield {
+                "service": service.rstrip(b"\0").decode(),
+                "endpoint": endpoints.get(eid, f"#{eid}"),
+                "status": status,
+                "latency_us": -1 if latency == _LATENCY_UNKNOWN else latency,
+                "request_id": request_id,
+                "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ts)),
+                "level": "INFO",
+            }
+        else:
+            raise ValueError(f"corrupt log: unknown record type {kind} at offset {pos}")
+
+
+def main(paths):
+    for path in paths:
+        with open(path, "rb") as f:
+            for entry in decode(f.read()):
+                print(json.dumps(entry))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(2)
+    main(sys.argv[1:])
@@ -1,69 +1,258 @@
-from flask import Flask, request, jsonify
+from quart import Quart, request, jsonify
+import asyncio
+import hmac
 import time
 import logging
-import json
+import orjson
+import io
+import os
+import struct
+import uuid
+import sys
+from collections import deque
 
 SERVICE_NAME = "service-a"
 
 # Option C: structured JSON logs
 logging.basicConfig(level=logging.INFO, format="%(message)s")
-app = Flask(__name__)
+app = Quart(__name__)
 
-# Option D: super tiny metrics (in-memory counters)
+# Option D: super tiny metrics (in-memory counters). Handlers bump the module-level
+# Counter objects directly (no dict lookup); /metrics reads a snapshot via METRICS.
+class Counter:
+    __slots__ = ("n",)
+
+    def __init__(self):
+        self.n = 0
+
+REQUESTS_TOTAL = Counter()
+TOKEN_REQUESTS = Counter()
 METRICS = {
-    "requests_total": 0,
-    "token_requests": 0,
+    "requests_total": REQUESTS_TOTAL,
+    "token_requests": TOKEN_REQUESTS,
 }
 
+# Log lines are queued and written to stdout in batches by a background task,
+# one write() per flush instead of one per event. The queue is bounded: if the
+# flusher falls behind, the oldest lines are dropped. Until the flusher is running
+# (e.g. under app.test_client()) lines are written through immediately.
+LOG_FLUSH_INTERVAL_SECS = 0.005
+LOG_BATCH_MAX = 512
+_log_buf = deque(maxlen=10000)
+_log_out = None
+_log_task = None
+_log_failing = False
+
+# "ts" has one-second resolution, so format it once per second and reuse it
+_ts_cached_sec = 0
+_ts_cached_str = ""
+
 def log_json(level: str, payload: dict):
-    payload["ts"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    global _ts_cached_sec, _ts_cached_str
+    now = int(time.time())
+    if now != _ts_cached_sec:
+        _ts_cached_sec = now
+        _ts_cached_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now))
+    payload["ts"] = _ts_cached_str
     payload["level"] = level
-    print(json.dumps(payload))
+    _log_buf.append(orjson.dumps(payload))
+    if _log_task is None:
+        flush_logs_safely()
+
+# Optional binary access log (LOG_FORMAT=binary): instead of a JSON line per request,
+# append a fixed-layout record to <BINARY_LOG_DIR>/<service>-<pid>.bin (one file per
+# worker process). Error events stay JSON on stdout. Decode with python-http/logtool.py.
+#   endpoint record: type=0, endpoint_id, name length, then the UTF-8 name
+#   access record:   type=1, ts, status, latency_us (0xFFFFFFFF = unknown), service,
+#                    request_id, endpoint_id, request_id kind; kind 1 = 32-char hex and
+#                    kind 2 = dashed UUID, both packed into the 16-byte field; kind 0 =
+#                    any other id, written after the record as a uint16 length + UTF-8
+LOG_BINARY = os.environ.get("LOG_FORMAT", "json") == "binary"
+BINARY_LOG_DIR = os.environ.get("BINARY_LOG_DIR", ".")
+_REC_ENDPOINT = struct.Struct("<BHH")
+_REC_ACCESS = struct.Struct("<BdHI16s16sHB")
+_LATENCY_UNKNOWN = 0xFFFFFFFF
+_SERVICE_TAG = SERVICE_NAME.encode()
+_REC_RID_LEN = struct.Struct("<H")
+_BIN_BUF_MAX = 10000
+_MAX_ENDPOINTS = 1024
+_endpoint_ids = {}
+_bin_buf = deque()
+_bin_out = None
+
+def _endpoint_id(endpoint: str) -> int:
+    eid = _endpoint_ids.get(endpoint)
+    if eid is None:
+        if len(_endpoint_ids) >= _MAX_ENDPOINTS:
+            endpoint = "other"
+            eid = _endpoint_ids.get(endpoint)
+            if eid is not None:
+                return eid
+        eid = len(_endpoint_ids)
+        _endpoint_ids[endpoint] = eid
+        name = endpoint.encode()
+        # definitions bypass the overflow check so later records can always be decoded
+        _bin_buf.append(_REC_ENDPOINT.pack(0, eid, len(name)) + name)
+    return eid
+
+def _pack_request_id(req_id: str):
+    # only pack ids that decode back to exactly the same string
+    if len(req_id) == 32:
+        try:
+            rid = bytes.fromhex(req_id)
+        except ValueError:
+            pass
+        else:
+            if rid.hex() == req_id:
+                return rid, 1
+    elif len(req_id) == 36:
+        try:
+            u = uuid.UUID(req_id)
+        except ValueError:
+            pass
+        else:
+            if str(u) == req_id:
+                return u.bytes, 2
+    return None, 0
+
+def log_access_binary(endpoint: str, status: int, latency_us: int, req_id: str):
+    eid = _endpoint_id(endpoint)
+    if len(_bin_buf) >= _BIN_BUF_MAX:
+        return  # flusher is behind: drop the newest record
+    tail = b""
+    rid, rid_kind = _pack_request_id(req_id)
+    if rid_kind == 0:
+        text = req_id.encode()[:0xFFFF]
+        rid, tail = b"", _REC_RID_LEN.pack(len(text)) + text
+    latency = min(latency_us, _LATENCY_UNKNOWN - 1) if latency_us >= 0 else _LATENCY_UNKNOWN
+    _bin_buf.append(_REC_ACCESS.pack(1, time.time(), status, latency, _SERVICE_TAG, rid, eid, rid_kind) + tail)
+
+def open_log_sink():
+    # Write straight to fd 1 when stdout is a real file; otherwise (captured or
+    # replaced stdout, pythonw) flush_logs falls back to sys.stdout.
+    global _log_out
+    try:
+        _log_out = io.BufferedWriter(io.FileIO(sys.stdout.fileno(), "wb", closefd=False), buffer_size=65536)
+    except (AttributeError, OSError, ValueError):
+        _log_out = None
+
+def flush_logs():
+    out = _log_out
+    while _log_buf:
+        batch = [_log_buf.popleft() for _ in range(min(len(_log_buf), LOG_BATCH_MAX))]
+        data = b"\n".join(batch) + b"\n"
+        if out is not None:
+            out.write(data)
+        elif sys.stdout is not None:
+            sys.stdout.write(data.decode())
+    if out is not None:
+        out.flush()
+    if _bin_out is not None and _bin_buf:
+        while _bin_buf:
+            _bin_out.write(b"".join([_bin_buf.popleft() for _ in range(min(len(_bin_buf), LOG_BATCH_MAX))]))
+        _bin_out.flush()
+
+def flush_logs_safely():
+    # A failed write (e.g. BrokenPipeError) drops that batch but must not stop
+    # logging; report it once per run of failures rather than every flush.
+    global _log_failing
+    try:
+        flush_logs()
+        _log_failing = False
+    except Exception as e:
+        if not _log_failing and sys.stderr is not None:
+            print(f"{SERVICE_NAME}: log flush failed: {e!r}", file=sys.stderr)
+        _log_failing = True
+
+async def log_flusher():
+    while True:
+        await asyncio.sleep(LOG_FLUSH_INTERVAL_SECS)
+        flush_logs_safely()
+
+# "METHOD /rule" strings for matched routes, built once per route and reused
+_endpoint_names = {}
+
+def endpoint_name() -> str:
+    rule = request.url_rule
+    if rule is None:
+        # unmatched (404): don't cache arbitrary client paths
+        return f"{request.method} {request.path}"
+    key = (request.method, rule.rule)
+    name = _endpoint_names.get(key)
+    if name is None:
+        name = _endpoint_names[key] = f"{request.method} {rule.rule}"
+    return name
 
 @app.before_request
-def start_timer():
-    request._start_time = time.perf_counter()
+async def start_timer():
+    request._start_ns = time.perf_counter_ns()
 
 @app.after_request
-def log_request(response):
-    METRICS["requests_total"] += 1
+async def log_request(response):
+    REQUESTS_TOTAL.n += 1
 
-    start = getattr(request, "_start_time", None)
-    latency_ms = (time.perf_counter() - start) * 1000 if start else -1
+    start = getattr(request, "_start_ns", None)
+    latency_us = (time.perf_counter_ns() - start) // 1000 if start else -1
 
     # Option B/E: request id tracing (header)
     req_id = request.headers.get("X-Request-ID", "")
 
+    endpoint = endpoint_name()
+    if LOG_BINARY:
+        log_access_binary(endpoint, response.status_code, latency_us, req_id)
+        return response
+
     log_json("INFO", {
         "service": SERVICE_NAME,
-        "endpoint": f"{request.method} {request.path}",
+        "endpoint": endpoint,
         "status": response.status_code,
-        "latency_ms": round(latency_ms, 2),
+        "latency_us": latency_us,
         "request_id": req_id
     })
     return response
 
+def fast_jsonify(**kw):
+    try:
+        return app.response_class(orjson.dumps(kw), mimetype="application/json")
+    except orjson.JSONEncodeError:
+        # orjson rejects some values the stdlib accepts (ints over 64 bits, lone surrogates)
+        return jsonify(**kw)
+
 @app.get("/health")
-def health():
-    return jsonify(status="ok"), 200
+async def health():
+    return fast_jsonify(status="ok"), 200
 
 # Option D: metrics endpoint
 @app.get("/metrics")
-def metrics():
-    return jsonify(METRICS), 200
+async def metrics():
+    return fast_jsonify(**{k: c.n for k, c in METRICS.items()}), 200
+
+# Simple fixed credentials (no DB); both /token responses are constant, so encode them once
+_USERNAME = b"divya"
+_PASSWORD = b"pass123"
+_TOKEN_OK = orjson.dumps({"token": "token-divya", "user": "divya"})
+_TOKEN_INVALID = orjson.dumps({"error": "invalid credentials"})
 
 # Option A / Best minimal: delay_ms support (slow simulation)
-def maybe_delay_from_query_or_json(delay_ms: int):
+async def maybe_delay_from_query_or_json(delay_ms: int):
     if delay_ms and delay_ms > 0:
-        time.sleep(delay_ms / 1000.0)
+        await asyncio.sleep(delay_ms / 1000.0)
 
 @app.post("/token")
-def token():
-    METRICS["token_requests"] += 1
+async def token():
+    TOKEN_REQUESTS.n += 1
 
-    body = request.get_json(silent=True) or {}
-    username = (body.get("username") or "").strip()
+    raw = await request.get_data(cache=False)
+    try:
+        body = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        body = None
+    if not isinstance(body, dict):
+        body = {}
+    username = body.get("username") or ""
     password = body.get("password") or ""
+    if isinstance(username, str):
+        username = username.strip()
 
     # allow optional slow simulation (either query or body)
     delay_ms = body.get("delay_ms") or request.args.get("delay_ms") or 0
@@ -72,14 +261,36 @@ def token():
     except Exception:
         delay_ms = 0
 
-    maybe_delay_from_query_or_json(delay_ms)
+    await maybe_delay_from_query_or_json(delay_ms)
 
-    # Simple fixed credential check (no DB)
-    if username == "divya" and password == "pass123":
+    # constant-time compare; "&" so both sides are always checked.
+    # Non-string values (e.g. a numeric password) are just invalid credentials.
+    if (isinstance(username, str) and isinstance(password, str)
+            and hmac.compare_digest(username.encode(), _USERNAME) & hmac.compare_digest(password.encode(), _PASSWORD)):
         # deterministic token (easy to debug)
-        return jsonify(token=f"token-{username}", user=username), 200
+        return app.response_class(_TOKEN_OK, status=200, mimetype="application/json")
+
+    return app.response_class(_TOKEN_INVALID, status=401, mimetype="application/json")
+
+@app.before_serving
+async def start_log_flusher():
+    global _log_task, _bin_out
+    if LOG_BINARY:
+        path = os.path.join(BINARY_LOG_DIR, f"{SERVICE_NAME}-{os.getpid()}.bin")
+        _bin_out = open(path, "ab", buffering=65536)
+    open_log_sink()
+    _log_task = asyncio.create_task(log_flusher())
 
-    return jsonify(error="invalid credentials"), 401
+@app.after_serving
+async def stop_log_flusher():
+    global _log_task
+    if _log_task:
+        _log_task.cancel()
+        _log_task = None
+    flush_logs_safely()
+    if _bin_out is not None:
+        _bin_out.close()
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=8080, debug=False)
+    # the built-in runner is a single dev process; serve through hypercorn instead
+    sys.exit("Run with: hypercorn -c file:hypercorn_conf.py app:app")
@@ -0,0 +1,12 @@
+# Production server settings for service-a.
+# Run with: hypercorn -c file:hypercorn_conf.py app:app
+import os
+
+bind = ["127.0.0.1:8080"]
+# One asyncio worker multiplexes many connections. /metrics counters live in
+# process memory, so more workers (e.g. WORKERS=4, up to one per core) split them.
+workers = int(os.environ.get("WORKERS", "1"))
+worker_class = "uvloop"
+# Service B expires idle pooled connections after 4 s, before this closes them
+keep_alive_timeout = 5
+backlog = 1000
@@ -0,0 +1,11 @@
+# Production server settings for service-b.
+# Run with: hypercorn -c file:hypercorn_conf.py app:app
+import os
+
+bind = ["127.0.0.1:8081"]
+# One asyncio worker multiplexes many connections. /metrics counters live in
+# process memory, so more workers (e.g. WORKERS=4, up to one per core) split them.
+workers = int(os.environ.get("WORKERS", "1"))
+worker_class = "uvloop"
+keep_alive_timeout = 5
+backlog = 1000